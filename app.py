@@ -1,7 +1,7 @@
 import streamlit as st
 from ui.sidebar import render_sidebar
 from ui.upload import render_upload_page
-from ui.chat import render_chat_page
+from ui.chat import render_chat_page, _get_embedder, _get_vector_store
 from ui.translate import render_translate_page
 
 st.set_page_config(
@@ -18,6 +18,13 @@ if "processed_papers" not in st.session_state:
 if "chat_history" not in st.session_state:
     st.session_state.chat_history = []
 
+# Warm the process-wide caches up front. These are cache_resource
+# singletons, so only the very first session of the process actually
+# loads anything — every later tab gets them back instantly, and the
+# first upload/question doesn't stall on the embedding-model load.
+_get_embedder()
+_get_vector_store()
+
 # Header
 st.title(" Research Paper Translator")
 st.caption("Powered by Ollama + ChromaDB + LangChain — 100% local, 100% private")
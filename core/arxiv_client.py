@@ -1,11 +1,31 @@
 import arxiv
+import asyncio
 import httpx
-import tempfile
+import re
 import os
-from sentence_transformers import SentenceTransformer
-from sklearn.metrics.pairwise import cosine_similarity
+from functools import lru_cache
 import numpy as np
 
+# Matches the page markers PDFLoader inserts ("--- PAGE 12 ---")
+_PAGE_RE = re.compile(r'--- PAGE \d+ ---')
+
+
+@lru_cache(maxsize=32)
+def _keywords_from_snippet(snippet: str) -> str:
+    """
+    Pulls search keywords out of the start of a paper.
+    Cached — the recommendation flow calls this with the same paper
+    text on every refresh, and the answer never changes.
+    """
+    snippet = _PAGE_RE.sub('', snippet)
+
+    # Take first 3 lines that aren't empty (usually title area)
+    lines = [l.strip() for l in snippet.split("\n") if l.strip()]
+    keywords = " ".join(lines[:3])
+
+    # Trim to reasonable search query length
+    return keywords[:150]
+
 class ArxivClient:
     """
     Handles everything related to arXiv:
@@ -14,13 +34,25 @@ class ArxivClient:
     3. Recommending similar papers based on uploaded paper
     """
 
-    def __init__(self, embedder=None):
+    def __init__(self, embedder=None, vector_store=None):
         """
         embedder: optional Embedder instance for recommendations
         If not provided, recommendations won't work but search will
+        vector_store: optional VectorStore — lets recommendations reuse
+        the paper-level vector stored at ingest time instead of
+        re-embedding the uploaded paper on every refresh
         """
-        self.client = arxiv.Client()
+        # page_size=100: one API round trip covers any candidate pool
+        # we request instead of paging at the default 100ms per page.
+        # The client keeps its session alive across search() calls, so
+        # repeated searches reuse the TCP connection too.
+        self.client = arxiv.Client(
+            page_size=100,
+            delay_seconds=0.5,
+            num_retries=2
+        )
         self.embedder = embedder
+        self.vector_store = vector_store
 
     def search(self, query: str, max_results: int = 10) -> list[dict]:
         """
@@ -54,11 +86,37 @@ class ArxivClient:
 
     def download_pdf(self, paper_dict: dict, save_dir: str = "./data/uploads") -> str:
         """
-        Downloads a paper PDF from arXiv.
+        Downloads a single paper PDF from arXiv.
         Returns the local file path where it was saved.
+        Thin sync wrapper around download_many().
+        """
+        return asyncio.run(self.download_many([paper_dict], save_dir=save_dir))[0]
+
+    async def download_many(
+        self,
+        paper_dicts: list[dict],
+        save_dir: str = "./data/uploads",
+        concurrency: int = 6
+    ) -> list[str]:
+        """
+        Downloads several paper PDFs concurrently.
+        Downloads are network-bound, so running them in parallel means
+        N files take roughly as long as the slowest single file.
+        concurrency: max simultaneous downloads (be nice to arXiv).
+        Returns local file paths in the same order as paper_dicts.
         """
         os.makedirs(save_dir, exist_ok=True)
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async with httpx.AsyncClient(follow_redirects=True, timeout=60) as client:
+            tasks = [
+                self._download_one(client, paper_dict, save_dir, semaphore)
+                for paper_dict in paper_dicts
+            ]
+            return list(await asyncio.gather(*tasks))
 
+    async def _download_one(self, client, paper_dict, save_dir, semaphore) -> str:
+        """Streams one PDF to disk, skipping files we already have."""
         arxiv_id = paper_dict["arxiv_id"]
         # Clean ID for filename (remove version like v1, v2)
         clean_id = arxiv_id.replace("/", "_")
@@ -69,11 +127,15 @@ class ArxivClient:
             print(f"PDF already exists: {save_path}")
             return save_path
 
-        print(f"Downloading PDF: {paper_dict['title'][:50]}...")
+        async with semaphore:
+            print(f"Downloading PDF: {paper_dict['title'][:50]}...")
 
-        # Use the paper object to download
-        paper_obj = paper_dict["paper_obj"]
-        paper_obj.download_pdf(dirpath=save_dir, filename=f"{clean_id}.pdf")
+            # Stream in chunks so big PDFs never sit fully in RAM
+            async with client.stream("GET", paper_dict["pdf_url"]) as response:
+                response.raise_for_status()
+                with open(save_path, "wb") as f:
+                    async for chunk in response.aiter_bytes(65536):
+                        f.write(chunk)
 
         print(f"Downloaded to: {save_path}")
         return save_path
@@ -83,7 +145,8 @@ class ArxivClient:
         uploaded_paper_text: str,
         query_keywords: str,
         top_n: int = 5,
-        candidate_pool: int = 20
+        candidate_pool: int = 20,
+        source_name: str = None
     ) -> list[dict]:
         """
         Recommends papers similar to the uploaded paper.
@@ -99,6 +162,9 @@ class ArxivClient:
         query_keywords: keywords to search arXiv (auto-generated or user provided)
         top_n: how many recommendations to return
         candidate_pool: how many arXiv papers to fetch as candidates
+        source_name: collection id of the uploaded paper — if its
+        paper-level vector is already stored, we reuse it instead of
+        re-embedding the paper text
         """
         if self.embedder is None:
             raise RuntimeError("Embedder required for recommendations")
@@ -111,29 +177,65 @@ class ArxivClient:
         if not candidates:
             return []
 
-        # Step 2: Embed the uploaded paper
-        # Use first 2000 chars (intro/abstract) — most representative
-        paper_snippet = uploaded_paper_text[:2000]
-        paper_embedding = np.array(
-            self.embedder.embed_single(paper_snippet)
-        ).reshape(1, -1)
+        abstracts = [c["abstract"] for c in candidates]
+
+        # Step 2: Get the uploaded paper's vector.
+        # If it was ingested already, its paper-level vector is stored
+        # in ChromaDB — reuse it and skip a whole embedder forward pass.
+        paper_vector = None
+        if source_name and self.vector_store is not None:
+            paper_vector = self.vector_store.get_paper_vector(source_name)
+            if paper_vector is not None:
+                print(f"Reusing stored paper vector for '{source_name}'")
 
-        # Step 3: Embed all candidate abstracts
         print(f"Embedding {len(candidates)} candidate abstracts...")
-        abstracts = [c["abstract"] for c in candidates]
-        candidate_embeddings = np.array(
-            self.embedder.embed_texts(abstracts)
-        )
 
-        # Step 4: Compute cosine similarity between uploaded paper
-        # and each candidate
-        similarities = cosine_similarity(paper_embedding, candidate_embeddings)[0]
+        if paper_vector is None:
+            # Step 2 + 3 fused: embed uploaded paper snippet and all
+            # candidate abstracts in ONE encode() call. Batching
+            # amortizes tokenizer + model overhead.
+            # Use first 2000 chars (intro/abstract) — most representative
+            paper_snippet = uploaded_paper_text[:2000]
+            embeddings = self.embedder.model.encode(
+                [paper_snippet] + abstracts,
+                batch_size=32,
+                convert_to_numpy=True,
+                normalize_embeddings=True,   # rows come back L2-normalized
+                show_progress_bar=False
+            )
+            paper_vector = embeddings[0]
+            candidate_embeddings = embeddings[1:]
+        else:
+            candidate_embeddings = self.embedder.model.encode(
+                abstracts,
+                batch_size=32,
+                convert_to_numpy=True,
+                normalize_embeddings=True,
+                show_progress_bar=False
+            )
+
+        # Step 4: Rows are unit vectors, so cosine similarity is just
+        # a dot product — one BLAS call, no sklearn overhead.
+        # Contiguous float32 keeps BLAS on its fast gemv path (mixed
+        # dtypes or strided views fall back to slow generic loops),
+        # which matters if candidate_pool is cranked up into the 100s.
+        candidate_embeddings = np.ascontiguousarray(
+            candidate_embeddings, dtype=np.float32
+        )
+        paper_vector = np.asarray(paper_vector, dtype=np.float32)
+        similarities = candidate_embeddings @ paper_vector
 
         # Step 5: Rank by similarity
-        ranked_indices = np.argsort(similarities)[::-1]  # descending order
+        # argpartition grabs the top N in O(N) instead of sorting the
+        # whole pool; we only sort those N afterwards
+        if top_n < len(similarities):
+            top_idx = np.argpartition(-similarities, top_n)[:top_n]
+        else:
+            top_idx = np.arange(len(similarities))
+        top_idx = top_idx[np.argsort(-similarities[top_idx])]  # descending order
 
         recommendations = []
-        for idx in ranked_indices[:top_n]:
+        for idx in top_idx:
             candidate = candidates[idx].copy()
             candidate["similarity_score"] = round(float(similarities[idx]), 4)
             candidate["similarity_pct"] = round(float(similarities[idx]) * 100, 1)
@@ -148,15 +250,4 @@ class ArxivClient:
         Takes first 500 chars (title + abstract area) and cleans it up.
         """
         # Take just the beginning — title and abstract
-        snippet = text[:500]
-
-        # Remove page markers we added
-        snippet = snippet.replace("--- PAGE 1 ---", "")
-        snippet = snippet.replace("--- PAGE 2 ---", "")
-
-        # Take first 2 lines that aren't empty (usually title area)
-        lines = [l.strip() for l in snippet.split("\n") if l.strip()]
-        keywords = " ".join(lines[:3])
-
-        # Trim to reasonable search query length
-        return keywords[:150]
+        return _keywords_from_snippet(text[:500])
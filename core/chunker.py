@@ -1,6 +1,135 @@
 from langchain_text_splitters import RecursiveCharacterTextSplitter
 import re
 
+# semantic-text-splitter is a Rust splitter (~10-30x faster than the
+# pure-Python LangChain one on multi-MB papers). Optional — we fall
+# back to LangChain if it isn't installed.
+try:
+    from semantic_text_splitter import TextSplitter as _RustTextSplitter
+except ImportError:
+    _RustTextSplitter = None
+
+
+# Splitter instances are stateless and configured only by
+# (chunk_size, chunk_overlap), yet a Chunker is built per upload.
+# Share them at module scope so every paper reuses the same splitter.
+_SPLITTERS: dict[tuple[int, int], object] = {}
+
+# The embedding model's own tokenizer, loaded on first use.
+# Measuring chunk size in tokens (instead of characters) matches what
+# MiniLM actually sees: char-counted chunks overshoot its 256-token
+# window on dense text (silent truncation!) and undershoot on sparse
+# text. The fast tokenizer is Rust, so this costs almost nothing.
+_TOKENIZER = None
+
+
+def _load_tokenizer():
+    """Loads the MiniLM fast tokenizer once; None if unavailable."""
+    global _TOKENIZER
+    if _TOKENIZER is None:
+        try:
+            from transformers import AutoTokenizer
+            _TOKENIZER = AutoTokenizer.from_pretrained(
+                "sentence-transformers/all-MiniLM-L6-v2", use_fast=True
+            )
+        except Exception:
+            _TOKENIZER = False   # remember the failure, fall back to chars
+    return _TOKENIZER or None
+
+
+def _token_length(text: str) -> int:
+    """Length of a string in embedder tokens."""
+    return len(_TOKENIZER.encode(text, add_special_tokens=False))
+
+
+def _get_splitter(chunk_size: int, chunk_overlap: int):
+    """Returns a shared splitter for this size/overlap combination."""
+    key = (chunk_size, chunk_overlap)
+    if key not in _SPLITTERS:
+        tokenizer = _load_tokenizer()
+        if _RustTextSplitter is not None and tokenizer is not None:
+            # Rust splitter measuring capacity in MiniLM tokens.
+            # It wants the raw Rust tokenizers.Tokenizer, not the
+            # transformers wrapper — backend_tokenizer unwraps it.
+            # Defensive fallback mirrors _load_tokenizer: a failure
+            # here must not take down every upload.
+            try:
+                _SPLITTERS[key] = _RustTextSplitter.from_huggingface_tokenizer(
+                    tokenizer.backend_tokenizer,
+                    capacity=chunk_size,
+                    overlap=chunk_overlap
+                )
+            except Exception:
+                _SPLITTERS[key] = _RustTextSplitter(
+                    capacity=chunk_size,
+                    overlap=chunk_overlap
+                )
+        elif _RustTextSplitter is not None:
+            # Rust splitter: same idea (split at semantic boundaries,
+            # merge up to capacity) but native-code fast
+            _SPLITTERS[key] = _RustTextSplitter(
+                capacity=chunk_size,
+                overlap=chunk_overlap
+            )
+        else:
+            # RecursiveCharacterTextSplitter tries to split on:
+            # 1. Double newlines (paragraphs) first
+            # 2. Single newlines second
+            # 3. Sentences (. ! ?) third
+            # 4. Words last
+            # This keeps chunks semantically meaningful
+            _SPLITTERS[key] = RecursiveCharacterTextSplitter(
+                chunk_size=chunk_size,
+                chunk_overlap=chunk_overlap,
+                separators=["\n\n", "\n", ".", "!", "?", " "],
+                # Token-aware when the tokenizer loaded, chars otherwise
+                length_function=_token_length if tokenizer is not None else len
+            )
+    return _SPLITTERS[key]
+
+
+def _merge_tiny(chunks: list[str], min_size: int, max_size: int) -> list[str]:
+    """
+    Post-pass over raw splitter output.
+
+    Single-pass recursive splitting leaves lots of tiny (<100 char)
+    chunks — section headers, stray lines — that waste retrieval slots
+    and cost an embedding each. Greedily merge a tiny chunk into its
+    neighbor as long as the result stays under max_size. Chunks that
+    come out oversized get hard-split back down.
+    """
+    merged = []
+    buffer = ""
+
+    for chunk in chunks:
+        if buffer and (len(buffer) < min_size or len(chunk) < min_size) \
+                and len(buffer) + len(chunk) + 1 <= max_size:
+            # One of the pair is context-poor — glue them together
+            buffer = f"{buffer}\n{chunk}"
+        else:
+            if buffer:
+                merged.append(buffer)
+            buffer = chunk
+
+    if buffer:
+        merged.append(buffer)
+
+    # Re-split anything that ended up oversized (rare, but keeps the
+    # embedder from silently truncating)
+    result = []
+    for chunk in merged:
+        while len(chunk) > max_size:
+            # Break at the last space before the limit, if there is one
+            cut = chunk.rfind(" ", 0, max_size)
+            if cut <= 0:
+                cut = max_size
+            result.append(chunk[:cut])
+            chunk = chunk[cut:].lstrip()
+        if chunk:
+            result.append(chunk)
+
+    return result
+
 class Chunker:
     """
     Splits extracted PDF text into overlapping chunks for RAG.
@@ -8,25 +137,27 @@ class Chunker:
 
     def __init__(
         self,
-        chunk_size: int = 500,       # max characters per chunk
-        chunk_overlap: int = 50,     # characters repeated between chunks
+        chunk_size: int = 200,       # max tokens per chunk (chars if no tokenizer)
+        chunk_overlap: int = 20,     # tokens repeated between chunks
     ):
         self.chunk_size = chunk_size
         self.chunk_overlap = chunk_overlap
-        self.chunks = []             # will hold final chunk dictionaries
-
-        # RecursiveCharacterTextSplitter tries to split on:
-        # 1. Double newlines (paragraphs) first
-        # 2. Single newlines second
-        # 3. Sentences (. ! ?) third
-        # 4. Words last
-        # This keeps chunks semantically meaningful
-        self.splitter = RecursiveCharacterTextSplitter(
-            chunk_size=self.chunk_size,
-            chunk_overlap=self.chunk_overlap,
-            separators=["\n\n", "\n", ".", "!", "?", " "],
-            length_function=len
-        )
+
+        # Parallel lists (ids / texts / metadatas) — filled by split()
+        self._ids = []
+        self._texts = []
+        self._metas = []
+
+        # Shared, reused across all Chunker instances with this config
+        self.splitter = _get_splitter(chunk_size, chunk_overlap)
+        self._use_rust = _RustTextSplitter is not None
+        self._token_based = _load_tokenizer() is not None
+
+    def _split_text(self, text: str) -> list[str]:
+        """Runs whichever splitter backend we ended up with."""
+        if self._use_rust:
+            return list(self.splitter.chunks(text))
+        return self.splitter.split_text(text)
 
     def split(self, text: str, source_name: str = "unknown"):
         """
@@ -37,45 +168,83 @@ class Chunker:
             raise ValueError("Text is empty — nothing to chunk")
 
         # Split the text
-        raw_chunks = self.splitter.split_text(text)
-
-        # Wrap each chunk in a dictionary with metadata
-        # This metadata travels with the chunk into ChromaDB
-        self.chunks = []
-        for index, chunk_text in enumerate(raw_chunks):
-            chunk = {
-                "id": f"{source_name}_chunk_{index}",   # unique ID
-                "text": chunk_text,                      # the actual content
-                "metadata": {
-                    "source": source_name,               # which paper
-                    "chunk_index": index,                # position in paper
-                    "total_chunks": len(raw_chunks),     # total chunks
-                    "char_count": len(chunk_text)        # size of this chunk
-                }
+        raw_chunks = self._split_text(text)
+
+        # Merge context-poor fragments (fewer chunks = fewer embeddings
+        # and better retrieval slots), allowing ~15% size headroom.
+        # _merge_tiny measures characters, so convert a token budget
+        # to an approximate char budget (~4 chars/token for English)
+        char_budget = self.chunk_size * 4 if self._token_based else self.chunk_size
+        raw_chunks = _merge_tiny(
+            raw_chunks,
+            min_size=100,
+            max_size=int(char_budget * 1.15)
+        )
+
+        # Store as parallel lists (structure-of-arrays) with metadata
+        # built once per chunk. The get_*_only() accessors used to
+        # rebuild a list from dicts per call — now they just hand the
+        # attribute back. The metadata travels with the chunk into
+        # ChromaDB either way.
+        total = len(raw_chunks)
+        self._ids = [f"{source_name}_chunk_{index}" for index in range(total)]
+        self._texts = raw_chunks
+        self._metas = [
+            {
+                "source": source_name,               # which paper
+                "chunk_index": index,                # position in paper
+                "total_chunks": total,               # total chunks
+                "char_count": len(chunk_text)        # size of this chunk
             }
-            self.chunks.append(chunk)
+            for index, chunk_text in enumerate(raw_chunks)
+        ]
 
         return self
 
+    @property
+    def chunks(self):
+        """
+        Chunk dictionaries, assembled from the parallel lists.
+        Only preview/debug paths want this shape — the hot ingest path
+        uses the get_*_only() accessors, which are now O(1).
+        """
+        return [
+            {"id": chunk_id, "text": text, "metadata": metadata}
+            for chunk_id, text, metadata in zip(self._ids, self._texts, self._metas)
+        ]
+
     def get_chunks(self):
         """Returns list of chunk dictionaries."""
         return self.chunks
 
     def get_chunk_count(self):
         """Returns how many chunks were created."""
-        return len(self.chunks)
+        return len(self._ids)
 
     def get_texts_only(self):
         """Returns just the text strings — needed for embedding later."""
-        return [chunk["text"] for chunk in self.chunks]
+        return self._texts
 
     def get_metadatas_only(self):
         """Returns just the metadata dicts — needed for ChromaDB later."""
-        return [chunk["metadata"] for chunk in self.chunks]
+        return self._metas
 
     def get_ids_only(self):
         """Returns just the IDs — needed for ChromaDB later."""
-        return [chunk["id"] for chunk in self.chunks]
+        return self._ids
+
+    def to_chroma_batch(self) -> dict:
+        """
+        Returns ids/texts/metadatas as one dict, ready to unpack into
+        VectorStore.add_chunks(**batch). Keeps the whole paper going to
+        ChromaDB as a single batched add — per-chunk adds pay sqlite
+        transaction overhead for every row.
+        """
+        return {
+            "ids": self.get_ids_only(),
+            "texts": self.get_texts_only(),
+            "metadatas": self.get_metadatas_only()
+        }
 
     def preview(self, num_chunks: int = 3):
         """
@@ -1,6 +1,15 @@
 from sentence_transformers import SentenceTransformer
+import hashlib
+import numpy as np
+import torch
 import os
 
+# Module-level model cache. Streamlit re-runs scripts (and can rebuild
+# Embedder instances) on every interaction — without this, each rebuild
+# would reload ~80MB of weights and re-warm torch. Keyed by
+# (model_name, device) so all Embedder instances share one model.
+_MODEL_CACHE: dict[tuple[str, str], SentenceTransformer] = {}
+
 class Embedder:
     """
     Converts text chunks into numerical vectors using
@@ -8,50 +17,131 @@ class Embedder:
     Runs 100% locally — no API needed.
     """
 
-    def __init__(self, model_name: str = "all-MiniLM-L6-v2"):
+    def __init__(self, model_name: str = "all-MiniLM-L6-v2", precision: str = "auto"):
         """
         model_name: the embedding model to use
         all-MiniLM-L6-v2 is small, fast, and good quality
         Downloads automatically on first run (~80MB)
+
+        precision: "auto" picks FP16 on GPU (half the memory traffic,
+        roughly double the throughput) and FP32 on CPU.
+        Pass "float32" to force full precision everywhere.
         """
-        print(f"Loading embedding model: {model_name}")
-        self.model = SentenceTransformer(model_name)
+        # Pick the best available device — GPU if we have one
+        device = "cuda" if torch.cuda.is_available() else "cpu"
+
+        cache_key = (model_name, device)
+        if cache_key not in _MODEL_CACHE:
+            print(f"Loading embedding model: {model_name} (device: {device})")
+            model = SentenceTransformer(model_name, device=device)
+
+            if device == "cuda" and precision == "auto":
+                # Half precision on GPU: same quality for retrieval,
+                # ~2x faster encode throughput
+                model = model.half()
+            elif device == "cpu":
+                # Let modern CPUs use faster matmul paths (TF32/bf16 capable)
+                torch.set_float32_matmul_precision("high")
+
+                if precision == "auto":
+                    # Dynamic int8 quantization of the Linear layers:
+                    # weights stored as int8, activations quantized on
+                    # the fly. Matmul on CPU is memory-bandwidth bound,
+                    # so halving (vs fp16) or quartering (vs fp32) the
+                    # bytes per weight roughly halves encode time, with
+                    # negligible retrieval-quality loss for MiniLM.
+                    # Best-effort — not every torch build ships the
+                    # quantized kernels.
+                    try:
+                        model = torch.quantization.quantize_dynamic(
+                            model, {torch.nn.Linear}, dtype=torch.qint8
+                        )
+                    except Exception:
+                        pass  # keep the fp32 model
+
+            _MODEL_CACHE[cache_key] = model
+            print("Embedding model loaded!")
+
+        self.model = _MODEL_CACHE[cache_key]
         self.model_name = model_name
-        print("Embedding model loaded!")
+        self.device = device
 
-    def embed_texts(self, texts: list[str]) -> list[list[float]]:
+    def embed_texts(self, texts: list[str], as_list: bool = False, batch_size: int = 64,
+                    quiet: bool = None):
         """
         Takes a list of text strings.
-        Returns a list of vectors (each vector is a list of floats).
+        Returns a 2-D numpy array of vectors (one row per text).
+
+        quiet=None (the default) auto-silences the progress bar and
+        prints for query-sized batches (< 16 texts) — interactive
+        search paths embed a handful of short strings per call and
+        shouldn't spam stdout. Bulk ingest still gets its progress bar.
+
+        Pass the WHOLE corpus in one call where you can: encode() sorts
+        its input by token length before batching (and restores order
+        after), so length-homogeneous batches waste almost no FLOPs on
+        padding — but it can only sort what it's given. Many small
+        calls re-pay the padding cost inside each one.
+
+        as_list=True returns plain Python lists instead — only needed
+        for consumers that can't take numpy arrays. The default avoids
+        allocating N x 384 Python float objects on every call.
         """
         if not texts:
             raise ValueError("No texts provided to embed")
 
-        print(f"Embedding {len(texts)} chunks...")
+        if quiet is None:
+            quiet = len(texts) < 16
+
+        # Dedupe identical texts before the model sees them. Papers
+        # repeat boilerplate (running headers, footers, reference
+        # lines survive cleaning), and embedding is by far the
+        # dominant cost — so each unique string goes through the
+        # transformer once and the rows fan back out afterwards.
+        # Hashing is microseconds per chunk; a no-duplicate corpus
+        # pays essentially nothing.
+        first_index: dict[bytes, int] = {}
+        fan_out = np.empty(len(texts), dtype=np.int64)
+        unique_texts = []
+        for i, text in enumerate(texts):
+            key = hashlib.blake2b(text.encode(), digest_size=8).digest()
+            j = first_index.get(key)
+            if j is None:
+                first_index[key] = j = len(unique_texts)
+                unique_texts.append(text)
+            fan_out[i] = j
+
+        if not quiet:
+            print(f"Embedding {len(unique_texts)} unique of {len(texts)} chunks...")
 
         # encode() does the heavy lifting
-        # convert_to_tensor=False gives us plain Python lists
-        embeddings = self.model.encode(
-            texts,
-            convert_to_tensor=False,
-            show_progress_bar=True    # shows a progress bar in terminal
-        )
+        # inference_mode skips autograd bookkeeping — we never backprop here
+        with torch.inference_mode():
+            embeddings = self.model.encode(
+                unique_texts,
+                batch_size=batch_size,
+                convert_to_numpy=True,
+                show_progress_bar=not quiet   # progress bar for bulk ingest only
+            )
 
-        # Convert from numpy array to plain Python list
-        # ChromaDB needs plain Python lists, not numpy arrays
-        embeddings_list = [embedding.tolist() for embedding in embeddings]
+        if len(unique_texts) < len(texts):
+            embeddings = embeddings[fan_out]
 
-        print(f"Created {len(embeddings_list)} embeddings")
-        print(f"Each embedding has {len(embeddings_list[0])} dimensions")
+        if not quiet:
+            print(f"Created {len(embeddings)} embeddings")
+            print(f"Each embedding has {embeddings.shape[1]} dimensions")
 
-        return embeddings_list
+        if as_list:
+            return embeddings.tolist()
+        return embeddings
 
     def embed_single(self, text: str) -> list[float]:
         """
         Embeds a single piece of text.
         Used later when embedding the user's question for search.
         """
-        embedding = self.model.encode([text], convert_to_tensor=False)
+        with torch.inference_mode():
+            embedding = self.model.encode([text], convert_to_numpy=True)
         return embedding[0].tolist()
 
     def get_model_name(self):
@@ -0,0 +1,131 @@
+import numpy as np
+
+# FAISS is an OPTIONAL dependency — only needed if you switch to this
+# backend for very large corpora. The default ChromaDB store works
+# without it. `pip install faiss-cpu` to enable.
+try:
+    import faiss
+except ImportError:
+    faiss = None
+
+
+class FaissVectorStore:
+    """
+    Drop-in alternative to VectorStore backed by a FAISS IVF-PQ index.
+
+    ChromaDB's HNSW is fine into the tens of thousands of chunks, but
+    past that its memory footprint (full float vectors per graph node)
+    starts to hurt. IVF-PQ trades a little recall for product-quantized
+    vectors (~16 bytes each here) and sublinear probe-based search —
+    the classic choice for 100k+ corpora.
+
+    Mirrors the VectorStore methods the Retriever actually calls
+    (add_chunks / search / get_collection_count), so swapping backends
+    is a one-line change where the store is constructed. Everything is
+    in-memory: FAISS holds the vectors, plain dicts hold the documents
+    and metadata that ChromaDB would otherwise keep in sqlite.
+    """
+
+    # Below this many training vectors, IVF centroids are garbage —
+    # use an exact flat index instead (it's fast at this size anyway)
+    _MIN_TRAIN = 4096
+
+    def __init__(self, nprobe: int = 8):
+        if faiss is None:
+            raise ImportError(
+                "FaissVectorStore requires faiss — pip install faiss-cpu"
+            )
+        self.nprobe = nprobe
+        # Per collection: {"index": faiss index, "ids": [...],
+        # "docs": {id: text}, "metas": {id: metadata}}
+        self._collections: dict[str, dict] = {}
+
+    def _get_or_create(self, collection_name: str, dim: int, initial_count: int):
+        """Builds the index lazily — layout depends on the first batch."""
+        if collection_name in self._collections:
+            return self._collections[collection_name]
+
+        if initial_count >= self._MIN_TRAIN:
+            # IVF100,PQ16: 100 coarse cells, vectors compressed to
+            # 16 bytes. Inner product == cosine for our unit vectors.
+            index = faiss.index_factory(
+                dim, "IVF100,PQ16", faiss.METRIC_INNER_PRODUCT
+            )
+        else:
+            index = faiss.IndexFlatIP(dim)
+
+        entry = {"index": index, "ids": [], "docs": {}, "metas": {}}
+        self._collections[collection_name] = entry
+        return entry
+
+    def add_chunks(
+        self,
+        collection_name: str,
+        ids: list[str],
+        embeddings,
+        texts: list[str],
+        metadatas: list[dict]
+    ):
+        """
+        Same contract as VectorStore.add_chunks. The first batch trains
+        the IVF centroids (if the index needs training), so front-load
+        a representative batch when possible.
+        """
+        embeddings = np.ascontiguousarray(embeddings, dtype=np.float32)
+        embeddings /= np.linalg.norm(embeddings, axis=1, keepdims=True) + 1e-12
+
+        entry = self._get_or_create(
+            collection_name, embeddings.shape[1], len(ids)
+        )
+        index = entry["index"]
+
+        if not index.is_trained:
+            index.train(embeddings)
+        index.add(embeddings)
+
+        entry["ids"].extend(ids)
+        for chunk_id, text, meta in zip(ids, texts, metadatas):
+            entry["docs"][chunk_id] = text
+            entry["metas"][chunk_id] = meta
+
+    def search(
+        self,
+        collection_name: str,
+        query_embedding,
+        n_results: int = 5
+    ) -> list[dict]:
+        """
+        Same contract as VectorStore.search — returns chunk dicts with
+        text / metadata / distance / similarity.
+        """
+        entry = self._collections.get(collection_name)
+        if entry is None or not entry["ids"]:
+            return []
+
+        index = entry["index"]
+        if hasattr(index, "nprobe"):
+            index.nprobe = self.nprobe
+
+        query = np.ascontiguousarray(query_embedding, dtype=np.float32).reshape(1, -1)
+        query /= np.linalg.norm(query) + 1e-12
+
+        n_results = min(n_results, len(entry["ids"]))
+        scores, rows = index.search(query, n_results)
+
+        chunks = []
+        for row, score in zip(rows[0], scores[0]):
+            if row < 0:   # FAISS pads missing results with -1
+                continue
+            chunk_id = entry["ids"][row]
+            chunks.append({
+                "text": entry["docs"][chunk_id],
+                "metadata": entry["metas"][chunk_id],
+                "distance": float(1.0 - score),
+                "similarity": float(np.round(score, 4))
+            })
+        return chunks
+
+    def get_collection_count(self, collection_name: str) -> int:
+        """Returns how many chunks are stored in a collection."""
+        entry = self._collections.get(collection_name)
+        return len(entry["ids"]) if entry else 0
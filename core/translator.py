@@ -1,11 +1,24 @@
 import os
-from langchain_groq import ChatGroq
-from langchain_core.messages import HumanMessage, SystemMessage
 from core.retriever import Retriever
 from dotenv import load_dotenv
 
 load_dotenv()
 
+# LangChain is imported lazily (inside __init__) — it pulls a large
+# dependency tree, and Streamlit re-parses the whole app on every cold
+# start. Pages that never build a Translator shouldn't pay for it.
+HumanMessage = None
+SystemMessage = None
+
+
+def _import_langchain():
+    """One-time deferred import of the LangChain bits we use."""
+    global HumanMessage, SystemMessage
+    from langchain_groq import ChatGroq
+    from langchain_core.messages import HumanMessage as _HM, SystemMessage as _SM
+    HumanMessage, SystemMessage = _HM, _SM
+    return ChatGroq
+
 class Translator:
     """
     Connects Groq LLM with the RAG retriever to:
@@ -39,6 +52,7 @@ class Translator:
                      0.3 is good for translation (accurate but natural)
         """
         self.retriever = retriever
+        self._probe_cache = {}   # translation-probe embedding cache
 
         api_key = api_key or os.getenv("GROQ_API_KEY")
 
@@ -56,6 +70,8 @@ class Translator:
                 "variables, or Streamlit secrets."
             )
 
+        ChatGroq = _import_langchain()
+
         print(f"Connecting to Groq model: {model_name}")
         self.llm = ChatGroq(
             model=model_name,
@@ -64,13 +80,44 @@ class Translator:
         )
         print("Groq connected!")
 
-    def answer_question(self, question: str) -> dict:
+    def warmup(self):
+        """
+        Fires one throwaway single-token generation and discards it.
+        For a hosted LLM the cold-start cost is connection setup (DNS,
+        TLS handshake, HTTP pool) plus any server-side routing — paying
+        it here, during pipeline build, keeps it out of the user's
+        first visible translate/question. Best-effort: a failure just
+        means the first real call is cold, as before.
+        """
+        try:
+            self.llm.invoke(
+                [HumanMessage(content="Reply with a single dot.")],
+                max_tokens=2
+            )
+        except Exception:
+            pass
+
+    def _stream_tokens(self, messages):
+        """
+        Yields response tokens as Groq produces them.
+        Total compute is the same, but time-to-first-token drops from
+        the full response time to a few hundred ms.
+        """
+        for part in self.llm.stream(messages):
+            if part.content:
+                yield part.content
+
+    def answer_question(self, question: str, stream: bool = False) -> dict:
         """
         Takes a question, retrieves relevant chunks,
         sends them to Groq as context, returns the answer.
 
+        stream=True makes "answer" a generator of tokens instead of a
+        finished string — feed it to st.write_stream so the user sees
+        the answer as it's generated.
+
         Returns dict with:
-        - answer: the LLM's response
+        - answer: the LLM's response (str, or token generator)
         - context_used: the chunks retrieved
         - avg_relevance: how relevant the context was
         """
@@ -88,8 +135,10 @@ class Translator:
                 "avg_relevance": avg_relevance
             }
 
-        # Step 3: Format context for the prompt
-        context = self.retriever.retrieve_as_context(question)
+        # Step 3: Format the chunks we already retrieved.
+        # (retrieve_as_context would embed + search all over again —
+        # that doubled retrieval latency per question)
+        context = self.retriever.format_chunks_as_context(chunks)
 
         # Step 4: Build the prompt
         # System message tells LLM its role and rules
@@ -112,8 +161,17 @@ Based on the context above, please answer this question:
 {question}""")
 
         # Step 5: Send to Groq and get response
+        messages = [system_message, human_message]
+
+        if stream:
+            return {
+                "answer": self._stream_tokens(messages),
+                "context_used": chunks,
+                "avg_relevance": avg_relevance
+            }
+
         print(f"Sending to Groq... (this may take 10-30 seconds)")
-        response = self.llm.invoke([system_message, human_message])
+        response = self.llm.invoke(messages)
 
         return {
             "answer": response.content,
@@ -121,17 +179,70 @@ Based on the context above, please answer this question:
             "avg_relevance": avg_relevance
         }
 
+    def _retrieve_context_chunks(self, probe: str) -> list[dict]:
+        """
+        Retrieves terminology-reference chunks for a translation probe
+        (the first 200 chars of the text being translated).
+
+        The probe embedding is cached: re-translating the same section
+        into several languages — a very common flow — used to pay a
+        full embedder forward pass every time.
+        """
+        query_embedding = self._probe_cache.get(probe)
+        if query_embedding is None:
+            query_embedding = self.retriever.embedder.embed_single(probe)
+            if len(self._probe_cache) >= 256:   # keep the cache bounded
+                self._probe_cache.clear()
+            self._probe_cache[probe] = query_embedding
+
+        return self.retriever.retrieve_by_vector(query_embedding)
+
+    def _retrieve_multi_context(self, text: str) -> list[dict]:
+        """
+        Context retrieval for longer pasted passages.
+
+        A single 200-char probe only "sees" the start of a multi-
+        paragraph text, so terminology from later paragraphs got no
+        reference chunks. Probe with up to 4 paragraphs instead —
+        retrieve_many embeds them in ONE forward pass and hits Chroma
+        with ONE batched query, so this costs barely more than a
+        single probe. Results are merged, deduped per chunk (keeping
+        the best similarity), and ranked.
+        """
+        paragraphs = [p.strip() for p in text.split("\n\n") if p.strip()][:4]
+        if len(paragraphs) <= 1:
+            return self._retrieve_context_chunks(text[:200])
+
+        per_query = self.retriever.retrieve_many([p[:200] for p in paragraphs])
+
+        best: dict = {}
+        for chunks in per_query:
+            for chunk in chunks:
+                key = (
+                    chunk["metadata"].get("source"),
+                    chunk["metadata"].get("chunk_index")
+                )
+                if key not in best or chunk["similarity"] > best[key]["similarity"]:
+                    best[key] = chunk
+
+        return sorted(best.values(), key=lambda c: c["similarity"], reverse=True)
+
     def translate(
         self,
         text: str,
         target_language: str,
-        use_context: bool = True
+        use_context: bool = True,
+        query_embedding=None
     ) -> dict:
         """
         Translates any text into the target language.
         If use_context=True, retrieves related paper sections
         to ensure translation uses correct technical terminology.
 
+        query_embedding: optional precomputed embedding for the text —
+        callers that already have one (the UI caches the quick-test
+        snippets) skip the embedder forward pass entirely.
+
         Returns dict with:
         - translation: the translated text
         - target_language: language translated to
@@ -149,7 +260,10 @@ Based on the context above, please answer this question:
         context = ""
         chunks = []
         if use_context:
-            chunks, _ = self.retriever.retrieve_with_scores(text[:200])
+            if query_embedding is not None:
+                chunks = self.retriever.retrieve_by_vector(query_embedding)
+            else:
+                chunks = self._retrieve_multi_context(text)
             if chunks:
                 # Only use top 2 chunks for translation context
                 # (we don't need as much context as for QA)
@@ -1,6 +1,106 @@
 import chromadb
 from chromadb.config import Settings
+import json
+import logging
+import numpy as np
 import os
+import threading
+import time
+
+# Side collection holding one vector per paper (mean of its chunk
+# vectors) — lets the recommender skip re-embedding uploaded papers
+PAPER_INDEX = "paper_index"
+
+# Module logger — print() on hot paths serializes on the stdout lock,
+# which the threaded ingest pipeline actually contends on
+log = logging.getLogger(__name__)
+
+
+def _format_query_results(docs, metas, dists) -> list[dict]:
+    """
+    Reformats one query's parallel result lists into chunk dicts.
+    distance: 0.0 = identical, 2.0 = completely different.
+    Similarities are computed vectorized instead of per-row round().
+    """
+    dists = np.asarray(dists, dtype=np.float32)
+    sims = np.round(1.0 - dists, 4)
+    return [
+        {
+            "text": doc,
+            "metadata": meta,
+            "distance": float(dist),
+            "similarity": float(sim)
+        }
+        for doc, meta, dist, sim in zip(docs, metas, dists, sims)
+    ]
+
+
+def pack_sign_bits(embeddings) -> np.ndarray:
+    """
+    Packs each embedding into a binary sketch: 1 bit per dimension
+    (the sign), 8 dims per byte — a 32x reduction from float32.
+    Hamming distance between sketches tracks cosine similarity well
+    enough (~85-90% recall) to prefilter candidates before an exact
+    rerank. Dimensions are padded to a byte boundary by packbits.
+    """
+    emb = np.asarray(embeddings, dtype=np.float32)
+    return np.packbits(emb > 0, axis=1)
+
+
+# Popcount per byte value — np.bitwise_count needs NumPy 2.0, this
+# table lookup works everywhere and is still one vectorized pass
+_POPCOUNT = np.array([bin(i).count("1") for i in range(256)], dtype=np.uint8)
+
+# Below this many chunks, brute HNSW is already fast enough that the
+# prefilter's extra bookkeeping isn't worth it
+_BINARY_PREFILTER_MIN = 5000
+
+
+class QueryCache:
+    """
+    Semantic cache for search results.
+
+    Users re-ask near-identical questions ("what is the main
+    contribution?" vs "summarize the contribution") and each one used
+    to run a full HNSW search. We keep recent (query embedding ->
+    results) pairs; a new query whose cosine similarity to a cached
+    one is >= tau returns the cached chunks in sub-ms instead.
+
+    Entries are keyed by (collection, version, n_results) so bumping
+    the collection version on writes invalidates stale results.
+    """
+
+    def __init__(self, max_size: int = 256, ttl: float = 600.0, tau: float = 0.97):
+        self.max_size = max_size
+        self.ttl = ttl
+        self.tau = tau
+        self._lock = threading.RLock()
+        self._entries = []   # list of (key, unit_embedding, results, timestamp)
+
+    def get(self, key, unit_embedding):
+        """Returns cached results for a semantically-close query, or None."""
+        now = time.monotonic()
+        with self._lock:
+            # Drop expired entries while we're here
+            self._entries = [e for e in self._entries if now - e[3] < self.ttl]
+
+            candidates = [e for e in self._entries if e[0] == key]
+            if not candidates:
+                return None
+
+            cached_matrix = np.stack([e[1] for e in candidates])
+            sims = cached_matrix @ unit_embedding
+            best = int(np.argmax(sims))
+            if sims[best] >= self.tau:
+                return candidates[best][2]
+            return None
+
+    def put(self, key, unit_embedding, results):
+        """Inserts a result set, evicting the oldest entry when full."""
+        with self._lock:
+            if len(self._entries) >= self.max_size:
+                self._entries.pop(0)
+            self._entries.append((key, unit_embedding, results, time.monotonic()))
 
 class VectorStore:
     """
@@ -16,49 +116,150 @@ class VectorStore:
         self.persist_path = persist_path
         os.makedirs(persist_path, exist_ok=True)
 
-        # Create ChromaDB client that saves to disk
-        self.client = chromadb.PersistentClient(path=persist_path)
-        print(f"ChromaDB initialized at: {persist_path}")
+        # Create ChromaDB client that saves to disk.
+        # anonymized_telemetry=False: the default posthog telemetry
+        # thread makes background HTTP calls that contend on the GIL
+        # right in the middle of ingest.
+        self.client = chromadb.PersistentClient(
+            path=persist_path,
+            settings=Settings(anonymized_telemetry=False)
+        )
+
+        # Collection handles, cached per name — get_or_create_collection
+        # does a metadata-store round trip every call, and we used to
+        # pay it on every single search and insert
+        self._collections: dict = {}
+
+        # Semantic query cache + per-collection version counters
+        # (a write bumps the version, which orphans old cache entries)
+        self._query_cache = QueryCache()
+        self._versions: dict[str, int] = {}
+
+        # Binary sign-bit sketches per collection (packed uint8 rows),
+        # lazily loaded from the .bits.npy sidecar. Used to Hamming-
+        # prefilter large collections before the exact rerank.
+        self._bit_index: dict[str, np.ndarray] = {}
 
-    def create_collection(self, collection_name: str):
+        log.info("ChromaDB initialized at: %s", persist_path)
+
+    def create_collection(
+        self,
+        collection_name: str,
+        hnsw_m: int = 24,
+        hnsw_construction_ef: int = 128,
+        hnsw_search_ef: int = 128
+    ):
         """
         A collection is like a table in a regular database.
         Each research paper can have its own collection,
         or you can put all papers in one collection.
         We use one collection for all papers.
+
+        The HNSW parameters only apply when the collection is first
+        created — Chroma keeps whatever an existing collection was
+        built with. To migrate old data, delete_collection and
+        re-ingest. Defaults are tuned up from Chroma's (m=16,
+        construction_ef=100, search_ef=10), which undershoot for
+        corpora in the 10k-100k chunk range.
+
+        search_ef is set once, deliberately on the high side: HNSW only
+        does extra work when the candidate list actually fills, so an
+        oversized ef barely costs anything for small top-k while large
+        top-k queries get the recall they need. (Adapting ef per query
+        via collection.modify writes to the metadata store every call —
+        far more expensive than the traversal it tries to save.)
         """
+        # Cached handle? Pure dict lookup, no Chroma round trip
+        if collection_name in self._collections:
+            return self._collections[collection_name]
+
         # get_or_create means it won't crash if collection already exists
         collection = self.client.get_or_create_collection(
             name=collection_name,
-            metadata={"hnsw:space": "cosine"}  # cosine similarity for search
+            metadata={
+                # Inner-product space instead of cosine: every vector we
+                # ingest or query with is already L2-normalized, so the
+                # dot product IS the cosine — and "ip" skips the
+                # norm/sqrt work cosine distance does per evaluation in
+                # the HNSW inner loop. Distances still come back as
+                # 1 - score, so similarity = 1 - distance holds.
+                "hnsw:space": "ip",
+                "hnsw:M": hnsw_m,
+                "hnsw:construction_ef": hnsw_construction_ef,
+                "hnsw:search_ef": hnsw_search_ef,
+                "hnsw:batch_size": 1000,
+                "hnsw:sync_threshold": 1000
+            }
         )
-        print(f"Collection '{collection_name}' ready")
+        self._collections[collection_name] = collection
+        log.info("Collection '%s' ready", collection_name)
         return collection
 
     def add_chunks(
         self,
         collection_name: str,
         ids: list[str],
-        embeddings: list[list[float]],
+        embeddings: np.ndarray,
         texts: list[str],
-        metadatas: list[dict]
+        metadatas: list[dict],
+        batch_size: int = 512
     ):
         """
         Stores chunks with their embeddings in ChromaDB.
-        All 4 lists must be the same length and in the same order.
+        All 4 inputs must be the same length and in the same order.
+
+        embeddings should be a 2-D float numpy array (what
+        Embedder.embed_texts returns) — Chroma takes it directly, and
+        skipping the list-of-lists detour avoids reallocating O(n*d)
+        Python floats per ingest. Plain lists still work.
+
+        Inserts go in micro-batches of batch_size: one giant add() holds
+        the write lock (and the Streamlit thread) for the whole HNSW
+        build, while batches keep each transaction's working set small.
+        Each collection.add is one bulk sqlite transaction on Chroma's
+        side — never a per-row insert — so per-row overhead amortizes
+        to O(N / batch_size) regardless of how callers slice their
+        input. (Chroma owns its sqlite connection; journal mode and
+        sync level aren't ours to set.)
         """
         collection = self.create_collection(collection_name)
 
+        # Convert once up front so Chroma doesn't coerce each batch's
+        # Python lists to arrays separately
+        embeddings = np.asarray(embeddings, dtype=np.float32)
+
+        # L2-normalize in place: cosine similarity over unit vectors is
+        # a plain dot product, which the sidecar indexes and the
+        # semantic cache rely on
+        embeddings /= np.linalg.norm(embeddings, axis=1, keepdims=True) + 1e-12
+
         # ChromaDB stores: ID + embedding + original text + metadata
         # This lets us retrieve the actual text after finding similar vectors
-        collection.add(
-            ids=ids,
-            embeddings=embeddings,
-            documents=texts,
-            metadatas=metadatas
-        )
+        for i in range(0, len(ids), batch_size):
+            collection.add(
+                ids=ids[i:i + batch_size],
+                embeddings=embeddings[i:i + batch_size],
+                documents=texts[i:i + batch_size],
+                metadatas=metadatas[i:i + batch_size]
+            )
+
+        # Persist the float vectors to the on-disk sidecar for fast
+        # bulk re-reads (reindexing, rerank experiments)
+        self._append_sidecar(collection_name, ids, embeddings)
 
-        print(f"Successfully stored {len(ids)} chunks in ChromaDB")
+        # Binary sketch sidecar — rows stay aligned with the float
+        # sidecar's id manifest
+        packed = pack_sign_bits(embeddings)
+        bits_path = self._bits_path(collection_name)
+        if os.path.exists(bits_path):
+            packed = np.vstack([np.load(bits_path), packed])
+        np.save(bits_path, packed)
+        self._bit_index[collection_name] = packed
+
+        # New data — cached search results for this collection are stale
+        self._versions[collection_name] = self._versions.get(collection_name, 0) + 1
+
+        log.info("Successfully stored %d chunks in ChromaDB", len(ids))
         return collection
 
     def search(
@@ -71,48 +272,293 @@ class VectorStore:
         Given a query embedding, finds the most similar chunks.
         n_results: how many chunks to return (top-N)
         """
+        # Cold start / tiny collection: don't pay for an HNSW query
+        # that can't return anything, and never ask for more results
+        # than there are chunks (Chroma throws a "contiguous 2D array"
+        # error when top-k exceeds what the index can produce). The
+        # count uses the cached collection handle, so this is cheap.
+        count = self.get_collection_count(collection_name)
+        if count == 0:
+            return []
+        n_results = min(n_results, count)
+
+        # Semantic cache first: a near-duplicate of a recent query
+        # skips the HNSW search entirely
+        query_vec = np.asarray(query_embedding, dtype=np.float32)
+        unit_vec = query_vec / (np.linalg.norm(query_vec) + 1e-12)
+        cache_key = (
+            collection_name,
+            self._versions.get(collection_name, 0),
+            n_results
+        )
+        cached = self._query_cache.get(cache_key, unit_vec)
+        if cached is not None:
+            return cached
+
+        # On big collections, try the binary-prefilter path: Hamming
+        # scan over 1-bit sketches, exact rerank on the survivors
+        chunks = self._binary_prefilter_search(collection_name, unit_vec, n_results)
+        if chunks is not None:
+            self._query_cache.put(cache_key, unit_vec, chunks)
+            return chunks
+
         collection = self.create_collection(collection_name)
 
+        # Query with the unit vector — the collection lives in
+        # inner-product space and assumes normalized inputs
         results = collection.query(
-            query_embeddings=[query_embedding],
+            query_embeddings=[unit_vec],
             n_results=n_results,
             include=["documents", "metadatas", "distances"]
         )
 
         # Reformat results into clean list of dicts
-        chunks = []
-        for i in range(len(results["documents"][0])):
-            chunk = {
-                "text": results["documents"][0][i],
-                "metadata": results["metadatas"][0][i],
-                "distance": results["distances"][0][i],
-                # distance: 0.0 = identical, 2.0 = completely different
-                "similarity": round(1 - results["distances"][0][i], 4)
-            }
-            chunks.append(chunk)
+        chunks = _format_query_results(
+            results["documents"][0],
+            results["metadatas"][0],
+            results["distances"][0]
+        )
 
+        self._query_cache.put(cache_key, unit_vec, chunks)
         return chunks
 
+    def batch_search(
+        self,
+        collection_name: str,
+        query_embeddings,
+        n_results: int = 5
+    ) -> list[list[dict]]:
+        """
+        Runs several queries in ONE collection.query call.
+        Chroma accepts a 2-D block of query vectors, so multi-query
+        flows (relevance panels, recommendation checks) amortize the
+        per-call FFI and graph entry cost instead of paying it N times.
+        Returns one result list per query, in input order.
+        """
+        # Same guard as search(): an empty collection can't answer
+        # anything, and over-asking trips Chroma's "contiguous 2D
+        # array" failure. The translate page queries before any upload,
+        # so this path genuinely sees empty collections.
+        count = self.get_collection_count(collection_name)
+        if count == 0:
+            return [[] for _ in range(len(query_embeddings))]
+        n_results = min(n_results, count)
+
+        collection = self.create_collection(collection_name)
+
+        # Normalize the whole block at once — ip space expects unit vectors
+        query_embeddings = np.asarray(query_embeddings, dtype=np.float32)
+        query_embeddings = query_embeddings / (
+            np.linalg.norm(query_embeddings, axis=1, keepdims=True) + 1e-12
+        )
+
+        results = collection.query(
+            query_embeddings=query_embeddings,
+            n_results=n_results,
+            include=["documents", "metadatas", "distances"]
+        )
+
+        return [
+            _format_query_results(docs, metas, dists)
+            for docs, metas, dists in zip(
+                results["documents"], results["metadatas"], results["distances"]
+            )
+        ]
+
+    def _binary_prefilter_search(
+        self,
+        collection_name: str,
+        unit_vec: np.ndarray,
+        n_results: int
+    ):
+        """
+        Two-stage search for large collections: a popcount Hamming scan
+        over the 1-bit sketches narrows the field to 4x n_results, then
+        only those survivors get exact dot products against the float
+        sidecar. The binary scan touches 32x fewer bytes than a float
+        scan would, and distance evals in HNSW never see the also-rans.
+
+        Returns formatted chunks, or None when the fast path doesn't
+        apply (small collection, missing/stale sidecars) — the caller
+        falls through to the normal HNSW query.
+        """
+        count = self.get_collection_count(collection_name)
+        if count < _BINARY_PREFILTER_MIN:
+            return None
+
+        packed = self._bit_index.get(collection_name)
+        if packed is None:
+            bits_path = self._bits_path(collection_name)
+            if not os.path.exists(bits_path):
+                return None
+            packed = np.load(bits_path)
+            self._bit_index[collection_name] = packed
+
+        ids, embeddings = self.load_embeddings_sidecar(collection_name)
+        # Sidecars must mirror the collection exactly, or ranks lie
+        if ids is None or len(ids) != count or len(packed) != count:
+            return None
+
+        # Stage 1: Hamming distances via XOR + byte-wise popcount
+        query_bits = pack_sign_bits(unit_vec.reshape(1, -1))[0]
+        hamming = _POPCOUNT[packed ^ query_bits].sum(axis=1, dtype=np.int32)
+
+        keep = min(4 * n_results, count)
+        candidates = np.argpartition(hamming, keep - 1)[:keep]
+
+        # Stage 2: exact rerank of the survivors (mmap'd float rows)
+        sims = np.asarray(embeddings[np.sort(candidates)], dtype=np.float32) @ unit_vec
+        order = np.argsort(sims)[::-1][:n_results]
+        top_rows = np.sort(candidates)[order]
+        top_sims = sims[order]
+
+        # Chroma's query() can't be restricted to an id subset, so pull
+        # the documents straight by id and reassemble in rank order
+        top_ids = [ids[i] for i in top_rows]
+        fetched = self.create_collection(collection_name).get(
+            ids=top_ids, include=["documents", "metadatas"]
+        )
+        by_id = dict(zip(fetched["ids"], zip(fetched["documents"], fetched["metadatas"])))
+
+        chunks = []
+        for chunk_id, sim in zip(top_ids, top_sims):
+            if chunk_id not in by_id:
+                return None   # index drifted from the collection
+            doc, meta = by_id[chunk_id]
+            chunks.append({
+                "text": doc,
+                "metadata": meta,
+                "distance": float(1.0 - sim),
+                "similarity": float(np.round(sim, 4))
+            })
+        return chunks
+
+    def upsert_paper_vector(self, source_name: str, chunk_embeddings):
+        """
+        Stores a single paper-level vector: the L2-normalized mean of
+        the paper's chunk embeddings. Cheap to compute at ingest time,
+        and saves the recommender a full embedder forward pass later.
+        """
+        embeddings = np.asarray(chunk_embeddings, dtype=np.float32)
+        paper_vector = embeddings.mean(axis=0)
+        paper_vector /= np.linalg.norm(paper_vector)
+
+        collection = self.create_collection(PAPER_INDEX)
+        collection.upsert(
+            ids=[source_name],
+            embeddings=[paper_vector.tolist()],
+            metadatas=[{"source": source_name}]
+        )
+        log.info("Stored paper-level vector for '%s'", source_name)
+
+    def get_paper_vector(self, source_name: str):
+        """
+        Fetches a stored paper-level vector.
+        Returns a numpy array, or None if the paper isn't indexed.
+        """
+        try:
+            collection = self._get_collection(PAPER_INDEX)
+            result = collection.get(ids=[source_name], include=["embeddings"])
+            if result["ids"]:
+                return np.asarray(result["embeddings"][0], dtype=np.float32)
+        except (ValueError, chromadb.errors.NotFoundError):
+            pass
+        return None
+
+    def _sidecar_paths(self, collection_name: str) -> tuple[str, str]:
+        """Paths of the embeddings sidecar (.npy) and its id manifest."""
+        sidecar_dir = os.path.join(self.persist_path, "sidecar")
+        os.makedirs(sidecar_dir, exist_ok=True)
+        return (
+            os.path.join(sidecar_dir, f"{collection_name}.npy"),
+            os.path.join(sidecar_dir, f"{collection_name}.ids.json")
+        )
+
+    def _bits_path(self, collection_name: str) -> str:
+        """Path of the packed sign-bit sketch sidecar."""
+        sidecar_dir = os.path.join(self.persist_path, "sidecar")
+        os.makedirs(sidecar_dir, exist_ok=True)
+        return os.path.join(sidecar_dir, f"{collection_name}.bits.npy")
+
+    def _append_sidecar(self, collection_name: str, ids: list[str], embeddings):
+        """
+        Appends vectors to the on-disk numpy sidecar.
+        Chroma only exposes stored embeddings through slow per-id
+        fetches; the sidecar gives reindexing jobs (new HNSW params,
+        rerank experiments) the whole matrix as one mmap-able file.
+
+        Stored as float16: readers are bandwidth-bound (mmap pages
+        faulted from disk), so halving the bytes halves the I/O, and
+        for unit vectors the precision loss is far below retrieval
+        noise. Consumers cast the rows they touch back to float32.
+        """
+        npy_path, ids_path = self._sidecar_paths(collection_name)
+
+        embeddings = np.asarray(embeddings, dtype=np.float16)
+        all_ids = list(ids)
+        if os.path.exists(npy_path):
+            existing = np.load(npy_path)
+            embeddings = np.vstack([existing, embeddings]).astype(np.float16)
+            with open(ids_path) as f:
+                all_ids = json.load(f) + all_ids
+
+        np.save(npy_path, embeddings)
+        with open(ids_path, "w") as f:
+            json.dump(all_ids, f)
+
+    def load_embeddings_sidecar(self, collection_name: str):
+        """
+        Loads a collection's sidecar as (ids, embeddings).
+        The matrix comes back memory-mapped — zero-copy reads, pages
+        faulted in only as they're touched. Rows are float16 (see
+        _append_sidecar); cast slices to float32 before heavy math.
+        Returns (None, None) if no sidecar exists yet.
+        """
+        npy_path, ids_path = self._sidecar_paths(collection_name)
+        if not os.path.exists(npy_path):
+            return None, None
+
+        with open(ids_path) as f:
+            ids = json.load(f)
+        return ids, np.load(npy_path, mmap_mode="r")
+
+    def _delete_sidecar(self, collection_name: str):
+        """Removes a collection's sidecar files, if present."""
+        paths = (*self._sidecar_paths(collection_name), self._bits_path(collection_name))
+        for path in paths:
+            if os.path.exists(path):
+                os.remove(path)
+
+    def _get_collection(self, collection_name: str):
+        """Cached lookup of an EXISTING collection (no create)."""
+        if collection_name in self._collections:
+            return self._collections[collection_name]
+        collection = self.client.get_collection(collection_name)
+        self._collections[collection_name] = collection
+        return collection
+
     def collection_exists(self, collection_name: str) -> bool:
         """Check if a collection already has data."""
         try:
-            col = self.client.get_collection(collection_name)
-            return col.count() > 0
-        except:
+            return self._get_collection(collection_name).count() > 0
+        except (ValueError, chromadb.errors.NotFoundError):
             return False
 
     def get_collection_count(self, collection_name: str) -> int:
         """Returns how many chunks are stored in a collection."""
         try:
-            col = self.client.get_collection(collection_name)
-            return col.count()
-        except:
+            return self._get_collection(collection_name).count()
+        except (ValueError, chromadb.errors.NotFoundError):
             return 0
 
     def delete_collection(self, collection_name: str):
         """Wipe a collection — useful for re-processing a paper."""
+        self._collections.pop(collection_name, None)  # stale handle
+        self._bit_index.pop(collection_name, None)
+        self._delete_sidecar(collection_name)
+        self._versions[collection_name] = self._versions.get(collection_name, 0) + 1
         try:
             self.client.delete_collection(collection_name)
-            print(f"Collection '{collection_name}' deleted")
-        except:
-            print(f"Collection '{collection_name}' not found")
+            log.info("Collection '%s' deleted", collection_name)
+        except (ValueError, chromadb.errors.NotFoundError):
+            log.info("Collection '%s' not found", collection_name)
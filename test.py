@@ -43,8 +43,12 @@ queries = [
     "What is the recipe for chocolate cake?",  # irrelevant query
 ]
 
-for q in queries:
-    chunks, score = retriever.retrieve_with_scores(q)
-    relevant = retriever.is_relevant(q)
+# One batched call — embeds all queries in a single forward pass and
+# hits ChromaDB once instead of once per query
+all_chunks = retriever.retrieve_many(queries)
+
+for q, chunks in zip(queries, all_chunks):
+    score = round(sum(c["similarity"] for c in chunks) / len(chunks), 4) if chunks else 0.0
+    relevant = score >= 0.3
     print(f"Query: '{q}'")
     print(f"Avg similarity: {score} | Relevant: {relevant}\n")
\ No newline at end of file
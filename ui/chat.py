@@ -1,3 +1,5 @@
+import numpy as np
+import threading
 import streamlit as st
 from core.embedder import Embedder
 from core.vector_store import VectorStore
@@ -5,44 +7,98 @@ from core.retriever import Retriever
 from core.translator import Translator
 
 
-def get_pipeline(settings: dict):
+@st.cache_resource(show_spinner=False)
+def _get_embedder():
     """
-    Initializes or retrieves the RAG pipeline from session state.
-    We cache it so it doesn't reload the model on every message.
+    One Embedder for the whole process.
+    cache_resource (unlike session_state) is shared across browser
+    sessions and reruns, so a second tab doesn't reload the model.
     """
-    # Check if pipeline already exists in session state
-    pipeline_key = f"pipeline_{settings['model']}"
+    return Embedder()
+
+
+@st.cache_resource(show_spinner=False)
+def _get_vector_store():
+    """One VectorStore (and ChromaDB client) for the whole process."""
+    return VectorStore()
+
+
+@st.cache_resource(show_spinner=False)
+def _build_pipeline(model_name: str):
+    """Builds the retriever + translator pair for one Groq model."""
+    retriever = Retriever(
+        embedder=_get_embedder(),
+        vector_store=_get_vector_store(),
+        collection_name="research_papers",
+        n_results=5
+    )
+
+    translator = Translator(
+        retriever=retriever,
+        model_name=model_name
+    )
+
+    # Warm the HNSW graph with a throwaway query. The first real search
+    # otherwise pays to fault the index segments in from disk — up to
+    # a few hundred ms on large collections — during the user's first
+    # message instead of during pipeline load.
+    try:
+        store = _get_vector_store()
+        if store.get_collection_count("research_papers") > 0:
+            dim = _get_embedder().model.get_sentence_embedding_dimension()
+            store.search(
+                collection_name="research_papers",
+                query_embedding=np.zeros(dim, dtype=np.float32).tolist(),
+                n_results=1
+            )
+    except Exception:
+        pass  # warm-up is best-effort only
 
-    if pipeline_key not in st.session_state:
-        with st.spinner("Loading AI pipeline..."):
-            # Reuse embedder and vector store if already created during upload
-            if "embedder" not in st.session_state:
-                st.session_state.embedder = Embedder()
+    # Warm the LLM connection too (DNS/TLS/HTTP pool) — in a thread so
+    # pipeline build doesn't wait on the network round trip
+    threading.Thread(target=translator.warmup, daemon=True).start()
 
-            if "vector_store" not in st.session_state:
-                st.session_state.vector_store = VectorStore()
+    return {
+        "retriever": retriever,
+        "translator": translator
+    }
 
-            embedder = st.session_state.embedder
-            store = st.session_state.vector_store
 
-            retriever = Retriever(
-                embedder=embedder,
-                vector_store=store,
-                collection_name="research_papers",
-                n_results=settings["n_results"]
-            )
+def get_pipeline(settings: dict):
+    """
+    Retrieves the process-wide RAG pipeline for the selected model.
+    Cached so nothing reloads on every message — or in every session.
+    """
+    with st.spinner("Loading AI pipeline..."):
+        pipeline = _build_pipeline(settings["model"])
 
-            translator = Translator(
-                retriever=retriever,
-                model_name=settings["model"]
-            )
+    # The slider can change between reruns — cheap to apply every time
+    pipeline["retriever"].set_n_results(settings["n_results"])
 
-            st.session_state[pipeline_key] = {
-                "retriever": retriever,
-                "translator": translator
-            }
+    # Keep session_state pointers for pages that still look there
+    # (sidebar stats, upload flow)
+    st.session_state.embedder = _get_embedder()
+    st.session_state.vector_store = _get_vector_store()
 
-    return st.session_state[pipeline_key]
+    return pipeline
+
+
+@st.cache_data(show_spinner=False)
+def _format_paper_list(papers: tuple, metas: tuple) -> list[str]:
+    """
+    Pre-formats the loaded-papers expander lines.
+    Streamlit reruns the whole page on every interaction, so even this
+    dict-walking and f-string work repeats per widget tick — memoize on
+    the (papers, metadata) tuples, which only change on ingest.
+    """
+    metas_dict = dict(metas)
+    lines = []
+    for paper in papers:
+        meta = dict(metas_dict.get(paper, ()))
+        lines.append(
+            f" **{paper}** — {meta.get('pages', '?')} pages, {meta.get('chunks', '?')} chunks"
+        )
+    return lines
 
 
 def render_chat_page(settings: dict):
@@ -58,9 +114,15 @@ def render_chat_page(settings: dict):
 
     # Show which papers are loaded
     with st.expander(f" {len(st.session_state.processed_papers)} paper(s) loaded"):
-        for paper in st.session_state.processed_papers:
-            meta = st.session_state.get("papers_metadata", {}).get(paper, {})
-            st.write(f" **{paper}** — {meta.get('pages', '?')} pages, {meta.get('chunks', '?')} chunks")
+        lines = _format_paper_list(
+            tuple(st.session_state.processed_papers),
+            tuple(sorted(
+                (name, tuple(sorted(meta.items())))
+                for name, meta in st.session_state.get("papers_metadata", {}).items()
+            ))
+        )
+        for line in lines:
+            st.write(line)
 
     st.divider()
 
@@ -102,13 +164,18 @@ def render_chat_page(settings: dict):
                     pipeline = get_pipeline(settings)
                     translator = pipeline["translator"]
 
-                    result = translator.answer_question(question)
+                    result = translator.answer_question(question, stream=True)
                     answer = result["answer"]
                     context = result["context_used"]
                     relevance = result["avg_relevance"]
 
-                    # Display answer
-                    st.write(answer)
+                    # Display answer — stream tokens as they arrive so
+                    # the user isn't staring at a spinner for 10-30s.
+                    # (Low-relevance short-circuit returns a plain string.)
+                    if isinstance(answer, str):
+                        st.write(answer)
+                    else:
+                        answer = st.write_stream(answer)
 
                     # Show relevance score
                     if relevance >= 0.25:
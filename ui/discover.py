@@ -1,15 +1,30 @@
+import hashlib
 import streamlit as st
 from core.arxiv_client import ArxivClient
+from ui.chat import _get_embedder, _get_vector_store
 
 
 def get_arxiv_client():
     """Get or create ArxivClient from session state."""
     if "arxiv_client" not in st.session_state:
-        embedder = st.session_state.get("embedder", None)
-        st.session_state.arxiv_client = ArxivClient(embedder=embedder)
+        st.session_state.arxiv_client = ArxivClient(
+            embedder=_get_embedder(),
+            vector_store=_get_vector_store()
+        )
     return st.session_state.arxiv_client
 
 
+@st.cache_data(ttl=3600, show_spinner=False)
+def _paper_keywords(text_hash: str, _client, _text: str) -> str:
+    """
+    Keywords for a paper, cached by content hash.
+    Keywords are deterministic per paper, so clicking "Find Similar
+    Papers" again shouldn't redo the extraction. Underscored args are
+    excluded from the cache key — the hash alone identifies the paper.
+    """
+    return _client.extract_keywords(_text)
+
+
 def render_paper_card(paper: dict, show_similarity: bool = False):
     """
     Renders a single paper card with metadata and action buttons.
@@ -74,8 +89,6 @@ def _import_paper(paper: dict):
     """
     from core.pdf_loader import PDFLoader
     from core.chunker import Chunker
-    from core.embedder import Embedder
-    from core.vector_store import VectorStore
 
     paper_filename = f"{paper['arxiv_id'].replace('/', '_')}.pdf"
 
@@ -111,34 +124,30 @@ def _import_paper(paper: dict):
         # Step 3: Chunk
         status.write("Chunking text...")
         source_name = paper['arxiv_id'].replace("/", "_").replace(".", "_")
-        chunker = Chunker(chunk_size=500, chunk_overlap=50)
+        chunker = Chunker(chunk_size=200, chunk_overlap=20)
         chunker.split(clean_text, source_name=source_name)
 
         status.write(f"Created {chunker.get_chunk_count()} chunks")
         progress.progress(65)
 
-        # Step 4: Embed
-        status.write("Generating embeddings...")
-        if "embedder" not in st.session_state:
-            st.session_state.embedder = Embedder()
-        embedder = st.session_state.embedder
-        embeddings = embedder.embed_texts(chunker.get_texts_only())
+        # Step 4 + 5: Embed and store, overlapped — shared pipeline
+        # with the upload flow (function-local import, as usual, since
+        # upload.py imports this module at top level)
+        status.write("Generating embeddings and storing...")
+        from ui.upload import embed_and_store
 
-        status.write(f"Generated {len(embeddings)} embeddings")
+        embedder = _get_embedder()
+        store = _get_vector_store()
+        embeddings = embed_and_store(chunker, embedder, store)
+
+        status.write(f"Embedded and stored {len(embeddings)} chunks")
         progress.progress(80)
 
-        # Step 5: Store
-        status.write("Storing in vector database...")
-        if "vector_store" not in st.session_state:
-            st.session_state.vector_store = VectorStore()
-        store = st.session_state.vector_store
-        store.add_chunks(
-            collection_name="research_papers",
-            ids=chunker.get_ids_only(),
-            embeddings=embeddings,
-            texts=chunker.get_texts_only(),
-            metadatas=chunker.get_metadatas_only()
-        )
+        # Paper-level vector — lets the recommender skip re-embedding
+        store.upsert_paper_vector(source_name, embeddings)
+
+        from ui.upload import _collection_count   # avoids import cycle
+        _collection_count.clear()
 
         progress.progress(95)
 
@@ -158,9 +167,10 @@ def _import_paper(paper: dict):
             "authors": paper["authors"]
         }
 
-        if "papers_text" not in st.session_state:
-            st.session_state.papers_text = {}
-        st.session_state.papers_text[paper_filename] = clean_text
+        # Function-local import: upload.py imports this module at top
+        # level, so importing it back up there would be a cycle
+        from ui.upload import set_paper_text
+        set_paper_text(paper_filename, clean_text)
 
         progress.progress(100)
         status.update(label="Import complete!", state="complete")
@@ -226,25 +236,31 @@ def render_recommendations_section():
     )
 
     if st.button("Find Similar Papers", use_container_width=True, type="primary"):
-        papers_text = st.session_state.get("papers_text", {})
+        from ui.upload import get_paper_text   # avoids import cycle
+        paper_text = get_paper_text(selected_paper)
 
-        if selected_paper not in papers_text:
+        if paper_text is None:
             st.warning("Paper text not available for recommendations. Try importing via arXiv search.")
             return
 
-        paper_text = papers_text[selected_paper]
-
         with st.spinner("Finding similar papers on arXiv... (30-60 seconds)"):
             try:
                 client = get_arxiv_client()
-                keywords = client.extract_keywords(paper_text)
+                text_hash = hashlib.blake2b(
+                    paper_text.encode(), digest_size=16
+                ).hexdigest()
+                keywords = _paper_keywords(text_hash, client, paper_text)
                 st.caption(f"Searching with keywords: {keywords[:80]}...")
 
+                source_name = st.session_state.get("papers_metadata", {}) \
+                    .get(selected_paper, {}).get("source_name")
+
                 recommendations = client.get_recommendations(
                     uploaded_paper_text=paper_text,
                     query_keywords=keywords,
                     top_n=5,
-                    candidate_pool=20
+                    candidate_pool=20,
+                    source_name=source_name
                 )
 
                 st.session_state["recommendations"] = recommendations
@@ -43,11 +43,11 @@ def render_sidebar():
 
         chunk_size = st.slider(
             "Chunk size",
-            min_value=200,
-            max_value=1000,
-            value=500,
-            step=50,
-            help="Characters per chunk when processing PDF"
+            min_value=64,
+            max_value=256,
+            value=200,
+            step=16,
+            help="Tokens per chunk when processing PDF (the embedding model reads at most 256)"
         )
 
         st.divider()
@@ -1,42 +1,57 @@
 import streamlit as st
-from core.embedder import Embedder
-from core.vector_store import VectorStore
-from core.retriever import Retriever
-from core.translator import Translator
 
-
-def get_pipeline(settings: dict):
-    pipeline_key = f"pipeline_{settings['model']}"
-
-    if pipeline_key not in st.session_state:
-        with st.spinner("Loading AI pipeline..."):
-            if "embedder" not in st.session_state:
-                st.session_state.embedder = Embedder()
-
-            if "vector_store" not in st.session_state:
-                st.session_state.vector_store = VectorStore()
-
-            embedder = st.session_state.embedder
-            store = st.session_state.vector_store
-
-            retriever = Retriever(
-                embedder=embedder,
-                vector_store=store,
-                collection_name="research_papers",
-                n_results=settings["n_results"]
-            )
-
-            translator = Translator(
-                retriever=retriever,
-                model_name=settings["model"]
-            )
-
-            st.session_state[pipeline_key] = {
-                "retriever": retriever,
-                "translator": translator
-            }
-
-    return st.session_state[pipeline_key]
+# One pipeline for the whole process — the chat page's cache_resource
+# loaders already share the embedder, vector store and translator
+# across sessions, so this page just borrows them instead of keeping
+# its own per-session copies in session_state.
+from ui.chat import get_pipeline, _get_embedder
+
+# Quick-test snippets offered at the bottom of the page. Fixed
+# constants, so their query embeddings can be computed once (below)
+# instead of on every translate click.
+_SNIPPETS = [
+    "The Transformer model architecture relies entirely on attention mechanisms, dispensing with recurrence and convolutions entirely.",
+    "Multi-head attention allows the model to jointly attend to information from different representation subspaces at different positions.",
+    "We propose a new simple network architecture, the Transformer, based solely on attention mechanisms.",
+    "The encoder maps an input sequence of symbol representations to a sequence of continuous representations."
+]
+
+
+@st.cache_data(show_spinner=False, max_entries=256)
+def _cached_translate(text: str, language: str, use_context: bool, model_name: str, _settings: dict) -> dict:
+    """
+    Memoized Translator.translate. Users re-click Translate on the
+    same snippet all the time (the quick-test buttons guarantee it),
+    and each miss costs a 10-30s LLM round trip — repeats become a
+    dict lookup. model_name is in the key so switching models in the
+    sidebar doesn't serve stale output; _settings is underscored out
+    of the key (the model it names is already covered).
+    """
+    translator = get_pipeline(_settings)["translator"]
+    query_embedding = _snippet_embeddings().get(text) if use_context else None
+    return translator.translate(
+        text=text,
+        target_language=language,
+        use_context=use_context,
+        query_embedding=query_embedding
+    )
+
+
+@st.cache_data(show_spinner=False, max_entries=256)
+def _cached_simplify(text: str, model_name: str, _settings: dict) -> dict:
+    """Memoized Translator.simplify — same reasoning as above."""
+    return get_pipeline(_settings)["translator"].simplify(text)
+
+
+@st.cache_resource(show_spinner=False)
+def _snippet_embeddings() -> dict:
+    """
+    Embeddings for the quick-test snippets, computed once per process.
+    Translating a clicked snippet can then skip the embedder's forward
+    pass for context retrieval — the most common path on this page.
+    """
+    vectors = _get_embedder().embed_texts(_SNIPPETS)
+    return dict(zip(_SNIPPETS, vectors))
 
 
 def render_translate_page(settings: dict):
@@ -49,14 +64,28 @@ def render_translate_page(settings: dict):
     st.write("Paste any text from the paper below to translate or simplify it.")
     st.divider()
 
+    _translate_fragment(settings)
+
+
+def _set_input_text(value: str):
+    """Button callback — fills (or clears) the input text area."""
+    st.session_state["translate_input"] = value
+
+
+@st.fragment
+def _translate_fragment(settings: dict):
+    """
+    The interactive part of the page, scoped as a fragment: snippet
+    clicks, Clear, and the translate/simplify actions rerun only this
+    subtree instead of the whole app (header, sidebar, other tabs).
+    """
     # Input section
     col1, col2 = st.columns([3, 1])
 
     with col1:
-        prefill = st.session_state.pop("prefill_text", "")
         input_text = st.text_area(
             " Text to translate",
-            value=prefill,
+            key="translate_input",
             height=200,
             placeholder="Paste any section from the research paper here...",
             help="You can paste directly from the paper or type any text"
@@ -98,23 +127,23 @@ def render_translate_page(settings: dict):
         )
 
     with col_clear:
-        clear_btn = st.button("Clear", use_container_width=True)
-
-    if clear_btn:
-        st.rerun()
+        # on_click callbacks run BEFORE the next (fragment) rerun, so
+        # the text area picks the new value up in the same pass — no
+        # explicit st.rerun round trip needed
+        st.button(
+            "Clear",
+            use_container_width=True,
+            on_click=_set_input_text,
+            args=("",)
+        )
 
     # Translation result
     if translate_btn and input_text.strip():
         st.divider()
         with st.spinner(f"Translating to {language}... (10-30 seconds)"):
             try:
-                pipeline = get_pipeline(settings)
-                translator = pipeline["translator"]
-
-                result = translator.translate(
-                    text=input_text,
-                    target_language=language,
-                    use_context=use_context
+                result = _cached_translate(
+                    input_text, language, use_context, settings["model"], settings
                 )
 
                 translation = result["translation"]
@@ -161,10 +190,7 @@ def render_translate_page(settings: dict):
         st.divider()
         with st.spinner("Simplifying text... (10-30 seconds)"):
             try:
-                pipeline = get_pipeline(settings)
-                translator = pipeline["translator"]
-
-                result = translator.simplify(input_text)
+                result = _cached_simplify(input_text, settings["model"], settings)
                 simplified = result["simplified"]
 
                 st.subheader(" Plain English Version")
@@ -201,14 +227,10 @@ def render_translate_page(settings: dict):
     st.subheader(" Quick Test Snippets")
     st.write("Click any snippet to auto-fill the text box:")
 
-    snippets = [
-        "The Transformer model architecture relies entirely on attention mechanisms, dispensing with recurrence and convolutions entirely.",
-        "Multi-head attention allows the model to jointly attend to information from different representation subspaces at different positions.",
-        "We propose a new simple network architecture, the Transformer, based solely on attention mechanisms.",
-        "The encoder maps an input sequence of symbol representations to a sequence of continuous representations."
-    ]
-
-    for snippet in snippets:
-        if st.button(f"{snippet[:80]}...", use_container_width=True):
-            st.session_state["prefill_text"] = snippet
-            st.rerun()
+    for snippet in _SNIPPETS:
+        st.button(
+            f"{snippet[:80]}...",
+            use_container_width=True,
+            on_click=_set_input_text,
+            args=(snippet,)
+        )
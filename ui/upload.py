@@ -1,12 +1,140 @@
 import streamlit as st
+import hashlib
+import json
 import os
-import tempfile
+import queue
+import numpy as np
+import zstandard as zstd
+from concurrent.futures import ThreadPoolExecutor
 from core.pdf_loader import PDFLoader
 from core.chunker import Chunker
-from core.embedder import Embedder
-from core.vector_store import VectorStore
+from ui.chat import _get_embedder, _get_vector_store
 from ui.discover import render_discover_section
 
+# Chunk batch size for the overlapped embed -> store pipeline
+_EMBED_BATCH = 256
+
+# Content-hash manifest, persisted next to the ChromaDB directory.
+# Maps blake2b(pdf bytes) -> what we embedded it as, so re-uploading
+# the same PDF under a new filename doesn't re-run the whole pipeline.
+_HASHES_PATH = "./data/paper_hashes.json"
+
+
+def embed_and_store(chunker, embedder, store, collection_name="research_papers"):
+    """
+    Overlapped embed -> store pipeline, shared by the upload and arXiv
+    import flows. A background thread writes batch N to ChromaDB while
+    the embedder is already working on batch N+1, so wall time is
+    max(embed, store) instead of their sum.
+    Returns the full embedding matrix (for the paper-level vector).
+    """
+    # Captured once into locals — the batched loop below slices
+    # these dozens of times
+    texts = chunker.get_texts_only()
+    ids = chunker.get_ids_only()
+    metadatas = chunker.get_metadatas_only()
+
+    batches = queue.Queue(maxsize=4)  # bounded = backpressure
+
+    def _store_batches():
+        while True:
+            item = batches.get()
+            if item is None:
+                return
+            batch_ids, batch_embeddings, batch_texts, batch_metas = item
+            store.add_chunks(
+                collection_name=collection_name,
+                ids=batch_ids,
+                embeddings=batch_embeddings,
+                texts=batch_texts,
+                metadatas=batch_metas
+            )
+
+    all_embeddings = []
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        writer = pool.submit(_store_batches)
+
+        try:
+            for i in range(0, len(texts), _EMBED_BATCH):
+                # A dead writer can never drain the bounded queue — put()
+                # would block forever. Surface its exception instead.
+                if writer.done():
+                    writer.result()
+
+                batch_embeddings = embedder.embed_texts(texts[i:i + _EMBED_BATCH])
+                all_embeddings.append(batch_embeddings)
+                batches.put((
+                    ids[i:i + _EMBED_BATCH],
+                    batch_embeddings,
+                    texts[i:i + _EMBED_BATCH],
+                    metadatas[i:i + _EMBED_BATCH]
+                ))
+        finally:
+            # Always send the sentinel (unless the writer already died),
+            # or the pool's shutdown(wait=True) would hang on a writer
+            # stuck in batches.get() — swallowing the real exception
+            if not writer.done():
+                batches.put(None)
+
+        writer.result()     # re-raises any store-side exception
+
+    return np.vstack(all_embeddings)
+
+
+@st.cache_data(ttl=5, show_spinner=False)
+def _collection_count(collection_name: str) -> int:
+    """
+    Chunk count for the sidebar metric, cached for a few seconds.
+    Streamlit re-renders this page on every widget tick, and each
+    render was a SELECT COUNT round trip into Chroma's sqlite. Ingest
+    and Clear invalidate explicitly, so the number never lags a write.
+    """
+    try:
+        return _get_vector_store().get_collection_count(collection_name)
+    except Exception:
+        return 0
+
+
+# papers_text holds the full cleaned text of every loaded paper —
+# megabytes of Python str sitting in session state for features (the
+# recommender) that read it rarely. Store it zstd-compressed (~4x
+# smaller, microseconds to pack/unpack) and decompress on demand.
+_ZSTD_COMPRESS = zstd.ZstdCompressor(level=3)
+_ZSTD_DECOMPRESS = zstd.ZstdDecompressor()
+
+
+def set_paper_text(name: str, text: str):
+    """Stores a paper's cleaned text in session state, compressed."""
+    if "papers_text" not in st.session_state:
+        st.session_state.papers_text = {}
+    st.session_state.papers_text[name] = _ZSTD_COMPRESS.compress(text.encode())
+
+
+def get_paper_text(name: str) -> str | None:
+    """Fetches a paper's cleaned text, or None if we don't have it."""
+    blob = st.session_state.get("papers_text", {}).get(name)
+    if blob is None:
+        return None
+    return _ZSTD_DECOMPRESS.decompress(blob).decode()
+
+
+def _load_paper_hashes() -> dict:
+    """The manifest, loaded once per session from disk."""
+    if "paper_hashes" not in st.session_state:
+        try:
+            with open(_HASHES_PATH) as f:
+                st.session_state.paper_hashes = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            st.session_state.paper_hashes = {}
+    return st.session_state.paper_hashes
+
+
+def _save_paper_hashes(hashes: dict):
+    """Writes the manifest back to disk."""
+    os.makedirs(os.path.dirname(_HASHES_PATH), exist_ok=True)
+    with open(_HASHES_PATH, "w") as f:
+        json.dump(hashes, f)
+
 
 def render_upload_page(settings: dict):
     st.header(" Upload Research Paper")
@@ -19,7 +147,9 @@ def render_upload_page(settings: dict):
     )
 
     if uploaded_file is not None:
-        file_size_kb = round(len(uploaded_file.getvalue()) / 1024, 2)
+        # UploadedFile knows its size — no need to materialize the
+        # whole PDF as bytes just to measure it
+        file_size_kb = round(uploaded_file.size / 1024, 2)
         col1, col2 = st.columns(2)
         col1.metric("File Name", uploaded_file.name)
         col2.metric("File Size", f"{file_size_kb} KB")
@@ -53,8 +183,13 @@ def render_upload_page(settings: dict):
     with col1:
         if st.button(" Clear All Papers", use_container_width=True):
             try:
-                if "vector_store" in st.session_state:
-                    st.session_state.vector_store.delete_collection("research_papers")
+                _get_vector_store().delete_collection("research_papers")
+                _collection_count.clear()
+                # The content-hash manifest must go too, or re-uploads
+                # of cleared papers would be skipped as "already done"
+                st.session_state.paper_hashes = {}
+                if os.path.exists(_HASHES_PATH):
+                    os.remove(_HASHES_PATH)
                 st.session_state.processed_papers = []
                 st.session_state.chat_history = []
                 st.session_state.papers_text = {}
@@ -67,26 +202,21 @@ def render_upload_page(settings: dict):
                 st.error(f"Error clearing: {str(e)}")
 
     with col2:
-        count = 0
-        if "vector_store" in st.session_state:
-            try:
-                count = st.session_state.vector_store.get_collection_count("research_papers")
-            except:
-                pass
-        st.metric("Chunks in database", count)
+        st.metric("Chunks in database", _collection_count("research_papers"))
 
     # Discover section (arXiv search + recommendations)
     render_discover_section()
 
 
 def _process_pdf(uploaded_file, settings: dict):
-    with tempfile.NamedTemporaryFile(delete=False, suffix=".pdf") as tmp_file:
-        tmp_file.write(uploaded_file.getvalue())
-        tmp_path = tmp_file.name
-
     source_name = os.path.splitext(uploaded_file.name)[0]
     source_name = source_name.replace(" ", "_").lower()
 
+    data = uploaded_file.getvalue()
+    content_hash = hashlib.blake2b(data, digest_size=16).hexdigest()
+    hashes = _load_paper_hashes()
+    known = hashes.get(content_hash)
+
     progress = st.progress(0)
     status = st.status("Starting processing...", expanded=True)
 
@@ -95,92 +225,111 @@ def _process_pdf(uploaded_file, settings: dict):
         status.write(" Extracting text from PDF...")
         progress.progress(10)
 
-        loader = PDFLoader(tmp_path)
-        loader.load().extract_text().clean()
+        # Straight from the upload buffer — no temp-file round trip
+        loader = PDFLoader.from_bytes(data, file_name=uploaded_file.name)
+        loader.extract_text().clean()
         clean_text = loader.get_text()
         metadata = loader.get_metadata()
 
         status.write(f" Extracted {len(clean_text):,} characters from {metadata['page_count']} pages")
         progress.progress(30)
 
+        if known is not None:
+            # Same bytes were embedded before (probably under another
+            # filename) — the chunks are already in ChromaDB. Keep the
+            # cheap extract above so the recommender has the text, but
+            # skip chunking, embedding and storing entirely.
+            source_name = known["source_name"]
+            chunk_count = known["chunks"]
+            status.write(
+                f" Recognized previously processed content ('{source_name}') "
+                "— skipping embedding"
+            )
+            progress.progress(95)
+            return _register_paper(
+                uploaded_file, source_name, chunk_count,
+                clean_text, metadata, loader, progress, status
+            )
+
         # Step 2: Chunk
         status.write(" Splitting into chunks...")
-        chunker = Chunker(chunk_size=settings["chunk_size"], chunk_overlap=50)
+        chunker = Chunker(chunk_size=settings["chunk_size"], chunk_overlap=20)
         chunker.split(clean_text, source_name=source_name)
         chunk_count = chunker.get_chunk_count()
 
         status.write(f" Created {chunk_count} chunks")
         progress.progress(50)
 
-        # Step 3: Embed
-        status.write(" Generating embeddings (this takes ~30 seconds)...")
+        # Step 3 + 4: Embed and store, overlapped
+        status.write(" Generating embeddings and storing...")
 
-        if "embedder" not in st.session_state:
-            st.session_state.embedder = Embedder()
+        embedder = _get_embedder()
+        store = _get_vector_store()
+        embeddings = embed_and_store(chunker, embedder, store)
 
-        embedder = st.session_state.embedder
-        embeddings = embedder.embed_texts(chunker.get_texts_only())
-
-        status.write(f" Generated {len(embeddings)} embeddings")
+        status.write(f" Embedded and stored {len(embeddings)} chunks")
         progress.progress(75)
 
-        # Step 4: Store in ChromaDB
-        status.write("Storing in vector database...")
+        # Paper-level vector — lets the recommender skip re-embedding
+        store.upsert_paper_vector(source_name, embeddings)
+        _collection_count.clear()   # the metric should show the new total now
+
+        status.write(f"Stored {chunk_count} chunks in ChromaDB")
+        progress.progress(95)
 
-        if "vector_store" not in st.session_state:
-            st.session_state.vector_store = VectorStore()
+        # Remember the content hash so a renamed re-upload of this PDF
+        # short-circuits next time
+        hashes[content_hash] = {"source_name": source_name, "chunks": chunk_count}
+        _save_paper_hashes(hashes)
 
-        store = st.session_state.vector_store
-        store.add_chunks(
-            collection_name="research_papers",
-            ids=chunker.get_ids_only(),
-            embeddings=embeddings,
-            texts=chunker.get_texts_only(),
-            metadatas=chunker.get_metadatas_only()
+        return _register_paper(
+            uploaded_file, source_name, chunk_count,
+            clean_text, metadata, loader, progress, status
         )
 
-        status.write(f"Stored {chunk_count} chunks in ChromaDB")
-        progress.progress(95)
+    except Exception as e:
+        progress.progress(0)
+        status.update(label=" Processing failed", state="error")
+        st.error(f"Error: {str(e)}")
+        st.info("Make sure your PDF is not password protected and try again.")
 
-        # Step 5: Save to session state
-        if "processed_papers" not in st.session_state:
-            st.session_state.processed_papers = []
 
-        if uploaded_file.name not in st.session_state.processed_papers:
-            st.session_state.processed_papers.append(uploaded_file.name)
+def _register_paper(
+    uploaded_file, source_name, chunk_count,
+    clean_text, metadata, loader, progress, status
+):
+    """
+    Step 5: records a processed (or recognized) paper in session state
+    and shows the result metrics. Shared by the full pipeline and the
+    content-hash short-circuit.
+    """
+    if "processed_papers" not in st.session_state:
+        st.session_state.processed_papers = []
 
-        if "papers_metadata" not in st.session_state:
-            st.session_state.papers_metadata = {}
+    if uploaded_file.name not in st.session_state.processed_papers:
+        st.session_state.processed_papers.append(uploaded_file.name)
 
-        st.session_state.papers_metadata[uploaded_file.name] = {
-            "pages": metadata["page_count"],
-            "chunks": chunk_count,
-            "characters": len(clean_text),
-            "source_name": source_name
-        }
+    if "papers_metadata" not in st.session_state:
+        st.session_state.papers_metadata = {}
 
-        # Store clean text for recommender
-        if "papers_text" not in st.session_state:
-            st.session_state.papers_text = {}
-        st.session_state.papers_text[uploaded_file.name] = clean_text
+    st.session_state.papers_metadata[uploaded_file.name] = {
+        "pages": metadata["page_count"],
+        "chunks": chunk_count,
+        "characters": len(clean_text),
+        "source_name": source_name
+    }
 
-        progress.progress(100)
-        status.update(label=" Processing complete!", state="complete")
+    # Store clean text (compressed) for the recommender
+    set_paper_text(uploaded_file.name, clean_text)
 
-        loader.close()
-        os.unlink(tmp_path)
+    progress.progress(100)
+    status.update(label=" Processing complete!", state="complete")
 
-        st.success(" Paper processed successfully! Go to the Chat or Translate tab.")
+    loader.close()
 
-        col1, col2, col3 = st.columns(3)
-        col1.metric("Pages", metadata["page_count"])
-        col2.metric("Chunks Created", chunk_count)
-        col3.metric("Characters", f"{len(clean_text):,}")
+    st.success(" Paper processed successfully! Go to the Chat or Translate tab.")
 
-    except Exception as e:
-        progress.progress(0)
-        status.update(label=" Processing failed", state="error")
-        st.error(f"Error: {str(e)}")
-        st.info("Make sure your PDF is not password protected and try again.")
-        if os.path.exists(tmp_path):
-            os.unlink(tmp_path)
+    col1, col2, col3 = st.columns(3)
+    col1.metric("Pages", metadata["page_count"])
+    col2.metric("Chunks Created", chunk_count)
+    col3.metric("Characters", f"{len(clean_text):,}")